@@ -7,6 +7,7 @@ from enex2notion.enex_types import EvernoteNote
 from enex2notion.note_parser.note_post_process_condense import condense_lines
 from enex2notion.note_parser.note_post_process_resources import resolve_resources
 from enex2notion.note_parser.note_type_based import parse_note_blocks_based_on_type
+from enex2notion.note_parser.string_extractor_properties import prefetch_notion_urls
 from enex2notion.notion_blocks.container import NotionCalloutBlock
 from enex2notion.notion_blocks.text import TextProp
 from enex2notion.utils_static import Rules
@@ -19,6 +20,8 @@ def parse_note(note: EvernoteNote, rules: Rules):
     if note_dom is None:
         return []
 
+    prefetch_notion_urls(note_dom)
+
     note_blocks = parse_note_blocks_based_on_type(
         note, note_dom, rules.add_pdf_preview, rules.mode_webclips
     )
@@ -37,8 +40,10 @@ def parse_note(note: EvernoteNote, rules: Rules):
 
 
 def _parse_note_dom(note: EvernoteNote) -> Optional[Tag]:
-    # Using html.parser because Evernote enml2 is basically HTML
-    note_dom = BeautifulSoup(note.content, "html.parser").find("en-note")
+    # Evernote enml2 is basically HTML, lxml parses it much faster
+    # than the pure-python html.parser backend; it wraps the fragment
+    # in <html><body>, but find("en-note") digs out the note anyway
+    note_dom = BeautifulSoup(note.content, "lxml").find("en-note")
 
     if not isinstance(note_dom, Tag):
         logger.error(f"Failed to extract DOM from note '{note.title}'")
@@ -1,101 +1,209 @@
+import functools
 import json
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import logging
 
 from bs4 import Tag
-from notion_client import Client
 import html
 
-from enex2notion.utils_colors import extract_color
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from enex2notion.utils_colors import extract_color, parse_style_decls
 from enex2notion.cli_args import args
 
 logger = logging.getLogger(__name__)
 
+# (path, mtime) -> (translation_dict, evernote id index)
+_LINKS_CACHE = {}
+
+_PREFETCH_WORKERS = 8
+
+# anchored so non-evernote hrefs fail on the first character
+_EVERNOTE_SCHEMES = re.compile(r"^(?:evernote|en-note):")
+
+# title -> (timestamp, url or None); negatives expire so
+# pages created mid-import still get picked up
+_NOTION_URL_CACHE = {}
+_NOTION_URL_CACHE_MAX = 4096
+_NEGATIVE_CACHE_TTL = 600
+
 
 def resolve_string_properties(tags: List[Tag]):
-    properties = set()
-
-    tag_map = {
-        "b": lambda e: ("b",),
-        "i": lambda e: ("i",),
-        "u": lambda e: ("_",),
-        "s": lambda e: ("s",),
-        "span": _resolve_span,
-        "a": _resolve_link,
-    }
+    properties = []
 
     for tag in tags:
-        if tag_map.get(tag.name):
-            tag_property = tag_map[tag.name](tag)
+        if tag.name not in _HANDLED_NAMES:
+            continue
 
-            if tag_property:
-                if isinstance(tag_property, list):
-                    properties.update(tag_property)
-                else:
-                    properties.add(tag_property)
+        static_property = _STATIC_PROPS.get(tag.name)
+        if static_property:
+            properties.append(static_property)
+            continue
+
+        tag_property = _DYNAMIC_HANDLERS[tag.name](tag)
+
+        if tag_property:
+            if isinstance(tag_property, list):
+                properties.extend(tag_property)
+            else:
+                properties.append(tag_property)
+
+    # callers compare property sets when merging adjacent strings,
+    # so dedup once at the end instead of hashing on every add
+    return set(properties)
 
-    return properties
+
+def prefetch_notion_urls(note_dom: Tag):
+    """Warm the Notion URL cache for all evernote links in the note
+
+    Lookups run concurrently so a note with many internal links
+    does not pay one serialized search round trip per link.
+    """
+
+    titles = set()
+
+    for link in note_dom.find_all("a"):
+        href = link.get("href")
+        if href and _EVERNOTE_SCHEMES.match(href):
+            try:
+                titles.add(_get_evernote_title(href))
+            except Exception:
+                continue  # let the per-string loop log the failure
+
+    if len(titles) > 1:
+        with ThreadPoolExecutor(max_workers=_PREFETCH_WORKERS) as pool:
+            for _ in pool.map(_prefetch_notion_url, titles):
+                pass  # noqa: WPS420
+
+
+def _prefetch_notion_url(title):
+    try:
+        _get_notion_url_from_title(title)
+    except Exception:
+        return  # let the per-string loop log the failure
 
 
 def _resolve_span(tag: Tag):
     properties = []
 
-    style = tag.get("style")
+    attrs = tag.attrs
+    if "style" not in attrs:
+        return []
+
+    style = attrs["style"]
     if not style:
         return []
 
-    color = extract_color(style)
+    style_decls = parse_style_decls(style)
+
+    color = extract_color(style_decls)
     if color is not None:
         properties.append(("h", color))
 
-    if re.match(r".*font-weight:\s*bold", style):
+    if style_decls.get("font-weight") == "bold":
         properties.append(("b",))
 
-    if re.match(r".*font-style:\s*italic", style):
+    if style_decls.get("font-style") == "italic":
         properties.append(("i",))
 
     return properties
 
 
 def _resolve_link(tag: Tag):
-    if tag.get("href"):
-        evernote_url = tag.get("href")
-        if "evernote://" in tag.get("href"):
+    href = tag.get("href")
+
+    if href:
+        if _EVERNOTE_SCHEMES.match(href):
             try:
-                notion_url = _get_notion_url(evernote_url)
+                notion_url = _get_notion_url(href)
 
                 if notion_url is None:
-                    logger.error(f"Notion URL retrieval failed: {evernote_url}")
-                    return "a", evernote_url
+                    logger.error(f"Notion URL retrieval failed: {href}")
+                    return "a", href
                 else:
                     return "a", notion_url
             except Exception as e:
                 logger.error(
-                    f"Notion URL retrieval failed: {evernote_url} with"
+                    f"Notion URL retrieval failed: {href} with"
                     f" exception {e}"
                 )
+                return "a", href
         else:
-            return "a", tag["href"]
+            return "a", href
     return None
 
 
+_STATIC_PROPS = {
+    "b": ("b",),
+    "i": ("i",),
+    "u": ("_",),
+    "s": ("s",),
+}
+
+_DYNAMIC_HANDLERS = {
+    "span": _resolve_span,
+    "a": _resolve_link,
+}
+
+_HANDLED_NAMES = frozenset(_STATIC_PROPS) | frozenset(_DYNAMIC_HANDLERS)
+
+
+@functools.lru_cache(maxsize=1)
+def _notion_client():
+    # deferred so notes without evernote:// links
+    # don't pay the notion_client import at startup
+    from notion_client import Client  # noqa: WPS433
+
+    return Client(auth=args.notion_api_secret)
+
+
 def _get_notion_url_from_title(title):
-    title = html.unescape(title)
+    cached = _NOTION_URL_CACHE.get(title)
+    if cached is not None:
+        cached_at, cached_url = cached
+        if cached_url is not None:
+            return cached_url
+        if time.time() - cached_at < _NEGATIVE_CACHE_TTL:
+            return None
+
+    notion_url = _search_notion_url(title)
+
+    if len(_NOTION_URL_CACHE) >= _NOTION_URL_CACHE_MAX:
+        oldest = min(_NOTION_URL_CACHE.items(), key=lambda cached: cached[1][0])
+        _NOTION_URL_CACHE.pop(oldest[0])
+
+    _NOTION_URL_CACHE[title] = (time.time(), notion_url)
+
+    return notion_url
+
+
+def _search_notion_url(title):
+    if "&" in title:
+        title = html.unescape(title)
     payload = {
         "query": f'"{title}"',  # we need the exact match
         "filter": {"value": "page", "property": "object"},
     }
 
-    notion = Client(auth=args.notion_api_secret)
+    notion = _notion_client()
 
     results = notion.request(path="search", method="post", body=payload)[
         "results"
     ]
 
-    for result in results:
-        if result["properties"]["Title"]["title"][0]["plain_text"] == title:
-            return result["url"]
+    # the query is quoted for exact match, so the first result
+    # is either the page we want or a miss
+    if results:
+        first = results[0]
+        if first["properties"]["Title"]["title"][0]["plain_text"] == title:
+            return first["url"]
 
     return None
 
@@ -104,21 +212,58 @@ def _get_notion_url(evernote_url):
     return _get_notion_url_from_title(_get_evernote_title(evernote_url))
 
 
-def _get_evernote_title(evernote_url):
-    with open(args.links_dict, "r", encoding="utf-8") as fp:
-        translation_dict = json.load(fp)
-
-    if evernote_url in translation_dict.keys():
-        return translation_dict[evernote_url]
-    else:
-        evernote_id = evernote_url.split("/")[-2].lower()
-        matches = [
-            value
-            for key, value in translation_dict.items()
-            if evernote_id in key.lower()
-        ]
-
-        if len(matches) == 1:
-            return matches[0]
+def _load_links_dict():
+    cache_key = (args.links_dict, os.path.getmtime(args.links_dict))
+
+    cached = _LINKS_CACHE.get(cache_key)
+    if cached is None:
+        with open(args.links_dict, "rb") as fp:
+            links_json = fp.read()
+
+        if orjson is not None:
+            translation_dict = orjson.loads(links_json)
         else:
-            raise f"Multiple match found for note: {evernote_url}"
+            translation_dict = json.loads(links_json)
+
+        cached = (translation_dict, _build_id_index(translation_dict))
+        _LINKS_CACHE[cache_key] = cached
+
+    return cached
+
+
+def _build_id_index(translation_dict):
+    id_index = {}
+    ambiguous = set()
+
+    for key, value in translation_dict.items():
+        if "/" not in key:
+            continue
+
+        evernote_id = key.lower().split("/")[-2]
+
+        if evernote_id in id_index:
+            ambiguous.add(evernote_id)
+
+        id_index[evernote_id] = value
+
+    for evernote_id in ambiguous:
+        id_index.pop(evernote_id)
+
+    return id_index
+
+
+def _get_evernote_title(evernote_url):
+    translation_dict, id_index = _load_links_dict()
+
+    title = translation_dict.get(evernote_url)
+    if title is not None:
+        return title
+
+    evernote_id = evernote_url.split("/")[-2].lower()
+
+    title = id_index.get(evernote_id)
+
+    if title is None:
+        raise RuntimeError(f"No unique match found for note: {evernote_url}")
+
+    return title
@@ -1,14 +1,14 @@
-import contextlib
 import re
 from functools import partial
 from math import sqrt
 from types import MappingProxyType
 
-from tinycss2 import parse_declaration_list
 from tinycss2.color3 import parse_color
 
 HEX_BASE = 16
 
+_RE_IMPORTANT = re.compile(r"\s*!\s*important\s*$", re.IGNORECASE)
+
 base16 = partial(int, base=HEX_BASE)
 
 EVERNOTE_STANDARD_FG = MappingProxyType(
@@ -80,14 +80,14 @@ COLORS_BG = MappingProxyType(
 )
 
 
-def extract_color(style):  # noqa: WPS210
+def extract_color(style_decls):  # noqa: WPS210
     color_map = {
         ".*en-highlight$": _extract_background_text,
         "^background-color$": _extract_background_rgb,
         "^color$": _extract_foreground_rgb,
     }
 
-    for s_name, s_value in _parse_style(style).items():
+    for s_name, s_value in style_decls.items():
         for regex, color_extract_func in color_map.items():
             if re.match(regex, s_name):
                 color = color_extract_func(s_value)
@@ -97,26 +97,21 @@ def extract_color(style):  # noqa: WPS210
     return None
 
 
-def _parse_style(style):
-    result_styles = {}
+def parse_style_decls(style):
+    """Split a style attribute into {lowercased name: value} pairs"""
 
-    declarations = (
-        d
-        for d in parse_declaration_list(style, skip_comments=True, skip_whitespace=True)
-        if d.type == "declaration"
-    )
+    style_decls = {}
 
-    for dec in declarations:
-        with contextlib.suppress(StopIteration):
-            result_styles[dec.lower_name] = next(
-                v for v in dec.value if v.type not in {"whitespace", "comment"}
-            )
+    for decl in style.split(";"):
+        decl_name, _, decl_value = decl.partition(":")
+        decl_value = _RE_IMPORTANT.sub("", decl_value.strip())
+        style_decls[decl_name.strip().lower()] = decl_value
 
-    return result_styles
+    return style_decls
 
 
-def _parse_css_color(color_token):
-    rgba = parse_color(color_token)
+def _parse_css_color(color_value):
+    rgba = parse_color(color_value)
 
     if rgba is None or rgba == "currentColor":
         return None
@@ -126,8 +121,8 @@ def _parse_css_color(color_token):
     return tuple(int(c * float_to_int_rgb) for c in (rgba[:3]))
 
 
-def _extract_background_text(color_token):
-    color = f"{color_token.value}_background"
+def _extract_background_text(color_value):
+    color = f"{color_value}_background"
 
     if color == "green_background":
         color = "teal_background"
@@ -138,8 +133,8 @@ def _extract_background_text(color_token):
     return None
 
 
-def _extract_background_rgb(color_token):
-    rbg_bg = _parse_css_color(color_token)
+def _extract_background_rgb(color_value):
+    rbg_bg = _parse_css_color(color_value)
 
     if rbg_bg is None:
         return None
@@ -155,8 +150,8 @@ def _extract_background_rgb(color_token):
     return None
 
 
-def _extract_foreground_rgb(color_token):
-    rbg_fg = _parse_css_color(color_token)
+def _extract_foreground_rgb(color_value):
+    rbg_fg = _parse_css_color(color_value)
 
     if rbg_fg is None:
         return None
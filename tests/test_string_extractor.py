@@ -1,3 +1,4 @@
+from enex2notion.note_parser import string_extractor_properties
 from enex2notion.note_parser.string_extractor import extract_string
 from enex2notion.notion_blocks.text import TextProp
 
@@ -345,3 +346,105 @@ def test_extract_text_color_inversion(parse_html):
     assert extract_string(test_note) == TextProp(
         text="yellow", properties=[["yellow", [["h", "yellow"]]]]
     )
+
+
+def test_prefetch_notion_urls(parse_html, mocker):
+    test_note = parse_html(
+        '<div><a href="evernote:///view/123/s1/abc/abc/">one</a></div>'
+        '<div><a href="evernote:///view/123/s1/def/def/">two</a></div>'
+    )
+
+    mocker.patch.object(string_extractor_properties, "_NOTION_URL_CACHE", {})
+    mocker.patch.object(
+        string_extractor_properties,
+        "_get_evernote_title",
+        side_effect=lambda url: url.split("/")[-2],
+    )
+    mock_search = mocker.patch.object(
+        string_extractor_properties,
+        "_search_notion_url",
+        side_effect=lambda title: f"https://www.notion.so/{title}",
+    )
+
+    string_extractor_properties.prefetch_notion_urls(test_note)
+
+    assert mock_search.call_count == 2
+    assert {
+        title: url
+        for title, (_, url) in string_extractor_properties._NOTION_URL_CACHE.items()
+    } == {
+        "abc": "https://www.notion.so/abc",
+        "def": "https://www.notion.so/def",
+    }
+
+
+def test_notion_url_cache_positive_hit(mocker):
+    mocker.patch.object(string_extractor_properties, "_NOTION_URL_CACHE", {})
+    mock_search = mocker.patch.object(
+        string_extractor_properties,
+        "_search_notion_url",
+        return_value="https://www.notion.so/abc",
+    )
+
+    first = string_extractor_properties._get_notion_url_from_title("abc")
+    second = string_extractor_properties._get_notion_url_from_title("abc")
+
+    assert first == second == "https://www.notion.so/abc"
+    assert mock_search.call_count == 1
+
+
+def test_notion_url_cache_negative_expiry(mocker):
+    mocker.patch.object(string_extractor_properties, "_NOTION_URL_CACHE", {})
+    mock_search = mocker.patch.object(
+        string_extractor_properties, "_search_notion_url", return_value=None
+    )
+    mock_time = mocker.patch.object(string_extractor_properties, "time")
+    mock_time.time.side_effect = [1000, 1100, 1601, 1602]
+
+    # miss at t=1000, cached negative at t=1100, expired at t=1601
+    assert string_extractor_properties._get_notion_url_from_title("gone") is None
+    assert string_extractor_properties._get_notion_url_from_title("gone") is None
+    assert mock_search.call_count == 1
+
+    assert string_extractor_properties._get_notion_url_from_title("gone") is None
+    assert mock_search.call_count == 2
+
+
+def test_notion_url_cache_bound(mocker):
+    mocker.patch.object(
+        string_extractor_properties,
+        "_NOTION_URL_CACHE",
+        {"old": (1, "https://www.notion.so/old")},
+    )
+    mocker.patch.object(string_extractor_properties, "_NOTION_URL_CACHE_MAX", 1)
+    mocker.patch.object(
+        string_extractor_properties,
+        "_search_notion_url",
+        return_value="https://www.notion.so/new",
+    )
+
+    string_extractor_properties._get_notion_url_from_title("new")
+
+    assert set(string_extractor_properties._NOTION_URL_CACHE) == {"new"}
+
+
+def test_extract_text_style_bold_important(parse_html):
+    test_note = parse_html(
+        '<div><span style="font-weight: bold !important;">bold</span></div>'
+    )
+
+    assert extract_string(test_note) == TextProp(
+        text="bold",
+        properties=[["bold", [["b"]]]],
+    )
+
+
+def test_extract_text_color_important(parse_html):
+    test_note = parse_html(
+        '<div><span style="color:red !important;">red</span></div>'
+    )
+
+    assert extract_string(test_note) == TextProp(
+        text="red",
+        properties=[["red", [["h", "red"]]]],
+    )